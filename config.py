@@ -7,13 +7,15 @@ GRASS_HSV_LOWER = (40, 30, 30)
 GRASS_HSV_UPPER = (80, 255, 255)
 
 # Detection sensitivity
-EDGE_THRESHOLD = (50, 150)  # Canny edge detection
-HOUGH_THRESHOLD = 100       # Line detection threshold
 MIN_GRASS_PIXELS = 5000     # Minimum grass area needed
 
 # Performance settings
 CAPTURE_FPS = 12
 PROCESSING_DOWNSCALE = 0.5  # Scale factor for faster processing
+OPENCV_THREADS = 4  # Upper bound on OpenCV's worker threads (the slope detectors also run in parallel)
+USE_DXGI_CAPTURE = True  # Capture with dxcam (DXGI) on Windows when installed, else mss
+CROP_REFRESH_FRAMES = 300  # Frames between fullscreen game area re-detections
+SCENE_CHANGE_THRESHOLD = 2.0  # Mean abs. difference per color channel of a 32x32 thumbnail below which a frame is skipped
 
 # Window detection settings
 SIMULATOR_WINDOWS = {
@@ -33,9 +35,11 @@ SIMULATOR_WINDOWS = {
 MAX_SLOPE_ANGLE = 15  # Maximum expected slope angle in degrees
 MAX_SIDE_SLOPE = 10   # Maximum expected side slope in degrees
 MIN_CONFIDENCE = 0.5  # Minimum confidence threshold (0-1)
+MIN_SLOPE_COVERAGE = 0.02  # Minimum grass fraction of the mask to run slope detection
+HORIZON_SCALE = 0.5      # Mask scale for horizon line detection
+PERSPECTIVE_SCALE = 0.25 # Mask scale for perspective rectangle fitting
 
 # Processing settings
-BLUR_KERNEL_SIZE = (5, 5)  # Gaussian blur kernel size
 MORPH_KERNEL_SIZE = (5, 5) # Morphological operation kernel size
 
 # Display settings
@@ -0,0 +1,71 @@
+"""
+Fast grass mask module for E6 TruGolf and GSPro Grass Slope Detection System.
+Provides a fused BGR to HSV threshold kernel compiled with Numba.
+"""
+
+import numpy as np
+from typing import Optional
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _grass_mask_kernel(bgr, lo_h, hi_h, lo_s, hi_s, lo_v, hi_v, out):
+        """
+        Threshold a BGR(A) image in HSV space without materializing the HSV image.
+        Uses the same fixed-point formula as OpenCV's 8-bit COLOR_BGR2HSV
+        (H scaled to 0-179).
+        """
+        rows, cols = bgr.shape[0], bgr.shape[1]
+        for y in prange(rows):
+            for x in range(cols):
+                b = np.int32(bgr[y, x, 0])
+                g = np.int32(bgr[y, x, 1])
+                r = np.int32(bgr[y, x, 2])
+
+                v = max(b, g, r)
+                diff = v - min(b, g, r)
+
+                s = 0
+                if v != 0:
+                    s = (diff * ((255 * 4096 + v // 2) // v) + 2048) >> 12
+
+                h = 0
+                if diff != 0:
+                    if v == r:
+                        h = g - b
+                    elif v == g:
+                        h = b - r + 2 * diff
+                    else:
+                        h = r - g + 4 * diff
+                    h = (h * ((180 * 4096 + 3 * diff) // (6 * diff)) + 2048) >> 12
+                    if h < 0:
+                        h += 180
+
+                if (lo_h <= h <= hi_h and lo_s <= s <= hi_s and lo_v <= v <= hi_v):
+                    out[y, x] = 255
+                else:
+                    out[y, x] = 0
+
+
+def bgr_to_grass_mask(bgr: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Equivalent of cv2.inRange(cv2.cvtColor(bgr, COLOR_BGR2HSV), lower, upper)
+    in a single pass over the BGR or BGRA frame.
+    """
+    if out is None:
+        out = np.empty(bgr.shape[:2], dtype=np.uint8)
+    _grass_mask_kernel(
+        bgr,
+        int(lower[0]), int(upper[0]),
+        int(lower[1]), int(upper[1]),
+        int(lower[2]), int(upper[2]),
+        out
+    )
+    return out
@@ -7,50 +7,105 @@ import cv2
 import numpy as np
 from typing import Tuple, Optional
 import config
+import fast_mask
 
 class GrassDetector:
     def __init__(self):
-        self.kernel = np.ones(config.MORPH_KERNEL_SIZE, np.uint8)
+        self.kernel = cv2.getStructuringElement(cv2.MORPH_RECT, config.MORPH_KERNEL_SIZE)
         # GSPro-specific: Additional color ranges for different grass types
-        self.grass_ranges = [
+        grass_ranges = [
             (config.GRASS_HSV_LOWER, config.GRASS_HSV_UPPER),  # Standard green
             ((35, 30, 30), (45, 255, 255)),  # Light green
             ((50, 30, 30), (70, 255, 255)),  # Dark green
         ]
+        # The ranges overlap, so their union is a single HSV box and one
+        # inRange pass is enough
+        self.grass_lower = np.array(
+            [min(lower[i] for lower, _ in grass_ranges) for i in range(3)], np.uint8
+        )
+        self.grass_upper = np.array(
+            [max(upper[i] for _, upper in grass_ranges) for i in range(3)], np.uint8
+        )
+
+        # Bounding box (x, y, w, h) of the last region found by
+        # get_largest_grass_region, so callers can crop to it
+        self.largest_region_bbox = None
+
+        # Per-frame work buffers, (re)allocated lazily when the frame size changes
+        self._buffer_shape = None
+        self._hsv = None
+        self._mask = None
+        self._mask_tmp = None
+
+    def _ensure_buffers(self, shape: Tuple[int, ...]):
+        """Allocate the reusable work buffers for the given frame shape."""
+        if self._buffer_shape != shape:
+            height, width = shape[:2]
+            self._hsv = np.empty((height, width, 3), dtype=np.uint8)
+            self._mask = np.empty((height, width), dtype=np.uint8)
+            self._mask_tmp = np.empty((height, width), dtype=np.uint8)
+            self._buffer_shape = shape
 
     def segment_grass(self, frame: np.ndarray) -> Tuple[np.ndarray, float]:
         """
         Extract grass regions using color and texture analysis.
+        Accepts BGR or BGRA frames; the alpha channel is ignored.
         Returns the grass mask and confidence score.
+
+        When Numba is installed the HSV conversion and threshold are fused
+        into a single kernel. Otherwise, when OpenCL is enabled the frame is
+        uploaded once as a UMat so the color conversion and morphology run on
+        the GPU, and only the final mask is downloaded.
+
+        On the CPU paths the returned mask is an internal buffer that is
+        overwritten by the next call.
         """
-        # Convert to HSV color space
-        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-        
-        # Create combined mask for all grass color ranges
-        combined_mask = np.zeros(frame.shape[:2], dtype=np.uint8)
-        for lower, upper in self.grass_ranges:
-            mask = cv2.inRange(hsv, lower, upper)
-            combined_mask = cv2.bitwise_or(combined_mask, mask)
-        
-        # Clean up the mask
-        mask = self.clean_grass_mask(combined_mask)
+        if fast_mask.NUMBA_AVAILABLE and frame.flags.c_contiguous:
+            self._ensure_buffers(frame.shape)
+            # Fused BGR -> HSV threshold, never materializes the HSV image
+            mask = fast_mask.bgr_to_grass_mask(
+                frame, self.grass_lower, self.grass_upper, out=self._mask
+            )
+            mask = self.clean_grass_mask(mask, tmp=self._mask_tmp, out=self._mask)
+        elif cv2.ocl.useOpenCL():
+            frame = cv2.UMat(frame)
+
+            # Convert to HSV color space
+            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+            
+            # Create mask covering all grass color ranges
+            mask = cv2.inRange(hsv, self.grass_lower, self.grass_upper)
+            
+            # Clean up the mask
+            mask = self.clean_grass_mask(mask).get()
+        else:
+            self._ensure_buffers(frame.shape)
+
+            # Convert to HSV color space
+            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=self._hsv)
+            
+            # Create mask covering all grass color ranges
+            mask = cv2.inRange(hsv, self.grass_lower, self.grass_upper, dst=self._mask)
+            
+            # Clean up the mask
+            mask = self.clean_grass_mask(mask, tmp=self._mask_tmp, out=self._mask)
         
         # Calculate confidence based on grass coverage
         confidence = self.validate_grass_region(mask)
         
         return mask, confidence
 
-    def clean_grass_mask(self, mask: np.ndarray) -> np.ndarray:
-        """Remove noise and improve grass region quality."""
-        # Apply Gaussian blur to reduce noise
-        mask = cv2.GaussianBlur(mask, config.BLUR_KERNEL_SIZE, 0)
-        
-        # Apply morphological operations
-        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel)
-        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
-        
-        # Threshold to get binary mask
-        _, mask = cv2.threshold(mask, 127, 255, cv2.THRESH_BINARY)
+    def clean_grass_mask(self, mask: np.ndarray,
+                         tmp: Optional[np.ndarray] = None,
+                         out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Remove noise and improve grass region quality.
+        Optional tmp/out buffers receive the intermediate and final masks.
+        """
+        # The inRange mask is already binary and morphology keeps it binary,
+        # so no blur/threshold pass is needed around these operations
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, self.kernel, dst=tmp)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel, dst=out)
         
         return mask
 
@@ -59,23 +114,18 @@ class GrassDetector:
         Ensure we have enough grass pixels for reliable detection.
         Returns confidence score between 0 and 1.
         """
+        assert mask.dtype == np.uint8, "grass mask must be uint8"
+
         # Count grass pixels
-        grass_pixels = np.count_nonzero(mask)
-        total_pixels = mask.shape[0] * mask.shape[1]
-        
-        # Calculate grass coverage ratio
-        coverage = grass_pixels / total_pixels
-        
-        # Calculate confidence based on coverage
+        grass_pixels = cv2.countNonZero(mask)
         if grass_pixels < config.MIN_GRASS_PIXELS:
             return 0.0
         
-        # Higher confidence for moderate coverage (not too sparse, not too dense)
-        if 0.2 <= coverage <= 0.8:
-            return 1.0
-        else:
-            # Lower confidence for extreme coverage values
-            return 0.5
+        # Higher confidence for moderate coverage (not too sparse, not too dense),
+        # lower confidence for extreme coverage values.
+        # 0.2 <= coverage <= 0.8, kept in integer arithmetic
+        total_pixels = mask.size
+        return 1.0 if total_pixels <= 5 * grass_pixels <= 4 * total_pixels else 0.5
 
     def get_grass_contours(self, mask: np.ndarray) -> list:
         """Get the contours of grass regions."""
@@ -88,15 +138,16 @@ class GrassDetector:
 
     def get_largest_grass_region(self, mask: np.ndarray) -> Optional[np.ndarray]:
         """Get the mask of the largest continuous grass region."""
-        contours = self.get_grass_contours(mask)
-        if not contours:
+        num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(
+            mask, connectivity=8, ltype=cv2.CV_32S
+        )
+        if num_labels < 2:  # Label 0 is the background
+            self.largest_region_bbox = None
             return None
-            
-        # Find the largest contour
-        largest_contour = max(contours, key=cv2.contourArea)
-        
+
+        # Find the largest component
+        largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+        self.largest_region_bbox = tuple(int(v) for v in stats[largest, :4])
+
         # Create a mask for the largest region
-        largest_mask = np.zeros_like(mask)
-        cv2.drawContours(largest_mask, [largest_contour], -1, 255, -1)
-        
-        return largest_mask 
\ No newline at end of file
+        return np.where(labels == largest, np.uint8(255), np.uint8(0))
@@ -0,0 +1,29 @@
+"""
+Lazy import helper for E6 TruGolf and GSPro Grass Slope Detection System.
+Defers loading heavy modules (OpenCV, NumPy, Numba) until first use.
+"""
+
+import importlib
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        # Only called for attributes not found on the proxy itself
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            self._module = module
+        value = getattr(module, attr)
+        # Bind it on the proxy, so later lookups are plain attribute
+        # accesses and skip this method
+        setattr(self, attr, value)
+        return value
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
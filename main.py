@@ -8,6 +8,8 @@ import numpy as np
 import time
 import sys
 import platform
+import queue
+import threading
 from screen_capture import ScreenCapture
 from grass_detector import GrassDetector
 from slope_calculator import SlopeCalculator
@@ -27,6 +29,25 @@ class SlopeDetectionApp:
         self.last_message_check = 0
         self.message_check_interval = 0.1  # Check messages every 100ms
 
+        # Pipeline queues: capture -> processing -> display (main thread)
+        self.frame_queue = queue.Queue(maxsize=2)
+        self.display_queue = queue.Queue(maxsize=2)
+        self.threads = []
+        self.last_simulator = None
+
+    @staticmethod
+    def _put_latest(q: queue.Queue, item):
+        """Put an item on a bounded queue, dropping the oldest entry when full."""
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+
     def calculate_fps(self):
         """Calculate and display FPS."""
         self.frame_count += 1
@@ -39,17 +60,45 @@ class SlopeDetectionApp:
     def handle_windows_specific(self):
         """Handle Windows-specific initialization."""
         if platform.system() == "Windows":
-            # Set process priority to high
+            physical_cores = None
+            logical_cores = None
             try:
                 import psutil
-                process = psutil.Process()
-                process.nice(psutil.HIGH_PRIORITY_CLASS)
-            except:
-                pass
+            except ImportError:
+                psutil = None
+
+            if psutil is not None:
+                # Set process priority to high
+                try:
+                    psutil.Process().nice(psutil.HIGH_PRIORITY_CLASS)
+                except:
+                    pass
+
+                # Core counts are queried separately, so a failed priority
+                # change does not also skip the affinity and thread settings
+                try:
+                    physical_cores = psutil.cpu_count(logical=False)
+                    logical_cores = psutil.cpu_count(logical=True)
+                except Exception as e:
+                    print(f"Warning: could not query CPU cores: {e}")
+
+            # Pin to one logical CPU per physical core. Windows numbers
+            # hyper-threaded siblings next to each other, so this only holds
+            # when every core has exactly two threads; hybrid CPUs mix
+            # single-threaded E-cores in and are left unpinned.
+            if physical_cores and logical_cores == 2 * physical_cores:
+                try:
+                    psutil.Process().cpu_affinity(list(range(0, logical_cores, 2)))
+                except Exception as e:
+                    print(f"Warning: could not set CPU affinity: {e}")
 
             # Configure OpenCV for Windows
             cv2.setUseOptimized(True)
             cv2.ocl.setUseOpenCL(True)
+            if physical_cores:
+                # At most one OpenCV worker per physical core avoids
+                # oversubscribing hyper-threads on small frames
+                cv2.setNumThreads(min(config.OPENCV_THREADS, physical_cores))
 
             # Import Windows-specific modules
             try:
@@ -70,45 +119,45 @@ class SlopeDetectionApp:
             except Exception as e:
                 print(f"Error processing Windows messages: {e}")
 
-    def run(self):
-        """Main application loop."""
-        self.running = True
-        print("Starting Golf Slope Detection System...")
-        print("Press 'q' to quit")
-        print("Waiting for E6 TruGolf or GSPro window...")
-
-        # Handle Windows-specific setup
-        self.handle_windows_specific()
-
-        # Initialize window
-        cv2.namedWindow(self.display.window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(self.display.window_name, config.DISPLAY_WIDTH, config.DISPLAY_HEIGHT)
-
+    def capture_loop(self):
+        """Capture thread: grab frames and hand them to the processing thread."""
         while self.running:
             try:
-                # Process Windows messages periodically
-                current_time = time.time()
-                if current_time - self.last_message_check >= self.message_check_interval:
-                    self.process_windows_messages()
-                    self.last_message_check = current_time
-
-                # Capture screen
                 frame = self.screen_capture.capture_golf_view()
                 if frame is None:
-                    time.sleep(0.1)
+                    time.sleep(self.screen_capture.frame_interval)
                     continue
 
                 # Get current simulator type
                 simulator = self.screen_capture.get_current_simulator()
-                if simulator and self.frame_count == 0:  # Only print on first frame
+                if simulator and simulator != self.last_simulator:
                     print(f"Detected simulator: {simulator}")
+                    self.last_simulator = simulator
+
+                self._put_latest(self.frame_queue, (frame, simulator))
+
+            except Exception as e:
+                print(f"Error in capture loop: {e}")
+                time.sleep(0.1)  # Prevent CPU spinning on error
+
+        # The mss instance belongs to this thread, so close it here
+        self.screen_capture.close_thread()
+
+    def processing_loop(self):
+        """Processing thread: detect grass, calculate slope and build the overlay."""
+        while self.running:
+            try:
+                try:
+                    frame, simulator = self.frame_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
 
                 # Detect grass
                 grass_mask, grass_confidence = self.grass_detector.segment_grass(frame)
-                
+
                 if grass_confidence < config.MIN_CONFIDENCE:
                     # Show original frame with low confidence message
-                    self.display.show_frame(frame)
+                    self._put_latest(self.display_queue, (frame, False))
                     continue
 
                 # Calculate slope
@@ -116,10 +165,7 @@ class SlopeDetectionApp:
                     grass_mask, frame
                 )
 
-                # Calculate FPS
-                self.calculate_fps()
-
-                # Create and show overlay
+                # Create overlay
                 overlay = self.display.create_overlay(
                     frame,
                     grass_mask,
@@ -129,22 +175,69 @@ class SlopeDetectionApp:
                     simulator
                 )
 
-                # Add FPS to display
-                cv2.putText(
-                    overlay,
-                    f"FPS: {self.fps}",
-                    (10, overlay.shape[0] - 20),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    (255, 255, 255),
-                    2
-                )
+                self._put_latest(self.display_queue, (overlay, True))
+
+            except Exception as e:
+                print(f"Error in processing loop: {e}")
+                time.sleep(0.1)  # Prevent CPU spinning on error
+
+    def run(self):
+        """Main application loop."""
+        self.running = True
+        print("Starting Golf Slope Detection System...")
+        print("Press 'q' to quit")
+        print("Waiting for E6 TruGolf or GSPro window...")
+
+        # Handle Windows-specific setup
+        self.handle_windows_specific()
 
-                # Show frame
-                self.display.show_frame(overlay)
+        # Initialize window
+        cv2.namedWindow(self.display.window_name, cv2.WINDOW_NORMAL)
+        cv2.resizeWindow(self.display.window_name, config.DISPLAY_WIDTH, config.DISPLAY_HEIGHT)
 
-                # Check for quit command
-                key = cv2.waitKey(1) & 0xFF
+        # Start capture and processing threads; display stays on the main thread
+        self.threads = [
+            threading.Thread(target=self.capture_loop, name="capture", daemon=True),
+            threading.Thread(target=self.processing_loop, name="processing", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+
+        while self.running:
+            try:
+                # Process Windows messages periodically
+                current_time = time.time()
+                if current_time - self.last_message_check >= self.message_check_interval:
+                    self.process_windows_messages()
+                    self.last_message_check = current_time
+
+                try:
+                    image, has_overlay = self.display_queue.get(timeout=self.message_check_interval)
+                except queue.Empty:
+                    image = None
+
+                if image is not None:
+                    if has_overlay:
+                        # Calculate FPS
+                        self.calculate_fps()
+
+                        # Add FPS to display
+                        cv2.putText(
+                            image,
+                            f"FPS: {self.fps}",
+                            (10, image.shape[0] - 20),
+                            cv2.FONT_HERSHEY_SIMPLEX,
+                            0.7,
+                            (255, 255, 255),
+                            2
+                        )
+
+                    # Show frame
+                    self.display.show_frame(image)
+
+                # Check for quit command (non-blocking; the display queue
+                # timeout above already paces this loop)
+                key = cv2.pollKey() & 0xFF
                 if key == ord('q'):
                     self.running = False
                 elif key == ord('r'):  # Reset window position
@@ -157,8 +250,12 @@ class SlopeDetectionApp:
 
     def cleanup(self):
         """Clean up resources."""
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout=1.0)
         try:
             self.screen_capture.cleanup()
+            self.slope_calculator.cleanup()
             self.display.cleanup()
         except Exception as e:
             print(f"Error during cleanup: {e}")
@@ -9,13 +9,28 @@ import mss
 import mss.tools
 from PIL import Image
 import cv2
+import threading
 import time
 from typing import Tuple, Optional, Dict
 import config
 
+try:
+    import win32gui
+except ImportError:
+    win32gui = None
+
+try:
+    import dxcam  # DXGI Desktop Duplication capture (Windows only)
+except ImportError:
+    dxcam = None
+
 class ScreenCapture:
     def __init__(self):
-        self.sct = mss.mss()
+        # mss instances only work on the thread that created them (mss 9 keeps
+        # its Windows device contexts in a threading.local), so each thread
+        # that captures gets its own, created on first use
+        self._local = threading.local()
+        self._scts = []  # Every instance created, for cleanup
         self.window = None
         self.capture_region = None
         self.last_capture_time = 0
@@ -24,6 +39,38 @@ class ScreenCapture:
         self.is_fullscreen = False
         self.last_window_check = 0
         self.window_check_interval = 5.0  # Check window every 5 seconds
+        self._hwnd = None  # Cached Win32 handle of the simulator window
+        self._window_rect = None  # Last seen (left, top, width, height)
+        self._prev_thumb = None  # Thumbnail of the last frame handed out
+        self._crop_rect = None  # Cached fullscreen game area (x, y, w, h)
+        self._crop_age = 0  # Frames since the game area was detected
+
+        # Prefer DXGI Desktop Duplication over GDI BitBlt when available
+        self._dx = None
+        self._dx_region = None  # Capture region in dxcam output coordinates
+        if dxcam is not None and config.USE_DXGI_CAPTURE:
+            try:
+                self._dx = dxcam.create(output_color="BGRA")
+            except Exception as e:
+                print(f"Warning: DXGI capture unavailable, using mss: {e}")
+
+    @property
+    def sct(self):
+        """Return the calling thread's mss instance, creating it on first use."""
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = mss.mss()
+            self._local.sct = sct
+            self._scts.append(sct)
+        return sct
+
+    def close_thread(self):
+        """Close the calling thread's mss instance, if it created one."""
+        sct = getattr(self._local, "sct", None)
+        if sct is not None:
+            self._local.sct = None
+            self._scts.remove(sct)
+            sct.close()
 
     def find_simulator_window(self) -> Optional[Tuple[gw.Window, str]]:
         """Find and return simulator window coordinates and type."""
@@ -106,8 +153,57 @@ class ScreenCapture:
                 "height": height
             }
 
+    def _get_window_rect(self) -> Optional[Tuple[int, int, int, int]]:
+        """Return the simulator window's (left, top, width, height), or None if it is gone."""
+        try:
+            if win32gui is not None and self._hwnd is not None:
+                # Query the cached handle directly instead of enumerating windows
+                if not win32gui.IsWindow(self._hwnd):
+                    return None
+                left, top, right, bottom = win32gui.GetWindowRect(self._hwnd)
+                return left, top, right - left, bottom - top
+            return self.window.left, self.window.top, self.window.width, self.window.height
+        except Exception:
+            return None
+
+    def _get_dxgi_region(self, region: dict) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Convert a capture region to dxcam's (left, top, right, bottom) on the
+        primary output. Returns None if DXGI capture is unavailable or the
+        region is not fully on the primary output.
+        """
+        if self._dx is None:
+            return None
+
+        # dxcam.create() captures the primary output, whose origin is always
+        # (0, 0) in Windows virtual-screen coordinates. mss's monitor order
+        # follows EnumDisplayMonitors and need not list the primary first.
+        left = region["left"]
+        top = region["top"]
+        right = left + region["width"]
+        bottom = top + region["height"]
+        if left < 0 or top < 0 or right > self._dx.width or bottom > self._dx.height:
+            return None
+        return left, top, right, bottom
+
+    def _grab_frame(self) -> Optional[np.ndarray]:
+        """Grab the capture region as a BGRA array."""
+        if self._dx_region is not None:
+            # Returns None when the desktop has not changed since the last grab
+            return self._dx.grab(region=self._dx_region)
+
+        screenshot = self.sct.grab(self.capture_region)
+        
+        # View the raw BGRA buffer as a numpy array without copying
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+            screenshot.height, screenshot.width, 4
+        )
+
     def capture_golf_view(self) -> Optional[np.ndarray]:
-        """Capture the main golf course view, avoiding UI."""
+        """
+        Capture the main golf course view, avoiding UI. Returns a BGRA frame,
+        or None when no new frame is due or the scene has not changed.
+        """
         current_time = time.time()
         if current_time - self.last_capture_time < self.frame_interval:
             return None
@@ -116,21 +212,36 @@ class ScreenCapture:
             self.window, self.current_simulator = self.find_simulator_window()
             if not self.window:
                 return None
+            self._hwnd = getattr(self.window, "_hWnd", None)
+
+        # Rebuild the capture region only when the window geometry changes
+        window_rect = self._get_window_rect()
+        if window_rect is None:
+            # Window was closed, look it up again on the next capture
+            self.window = None
+            self._hwnd = None
+            self._window_rect = None
+            self.capture_region = None
+            self.last_window_check = 0
+            return None
+        if window_rect != self._window_rect:
+            self._window_rect = window_rect
+            self.is_fullscreen = (window_rect[2] >= 1920 and window_rect[3] >= 1080)
+            self.capture_region = None
+            self._prev_thumb = None
+            self._crop_rect = None
 
         if not self.capture_region:
             self.capture_region = self.get_optimal_capture_region()
             if not self.capture_region:
                 return None
+            self._dx_region = self._get_dxgi_region(self.capture_region)
 
         try:
             # Capture the screen region
-            screenshot = self.sct.grab(self.capture_region)
-            
-            # Convert to numpy array
-            frame = np.array(screenshot)
-            
-            # Convert from BGRA to BGR
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+            frame = self._grab_frame()
+            if frame is None:
+                return None
             
             # For fullscreen, try to detect and crop to the actual game area
             if self.is_fullscreen:
@@ -142,9 +253,24 @@ class ScreenCapture:
                     int(frame.shape[1] * config.PROCESSING_DOWNSCALE),
                     int(frame.shape[0] * config.PROCESSING_DOWNSCALE)
                 )
-                frame = cv2.resize(frame, new_size)
+                frame = cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
+            
+            # The frame stays BGRA: the grass detector converts straight to
+            # HSV and the display drops the alpha channel when it copies the frame
 
             self.last_capture_time = current_time
+
+            # Skip frames that match the last one handed out, so the previous
+            # result stays on screen instead of reprocessing a static scene
+            # Compare the color channels only; the constant alpha channel
+            # would dilute the mean difference
+            thumb = cv2.resize(frame, (32, 32), interpolation=cv2.INTER_AREA)[..., :3]
+            if self._prev_thumb is not None:
+                diff = cv2.norm(thumb, self._prev_thumb, cv2.NORM_L1) / thumb.size
+                if diff < config.SCENE_CHANGE_THRESHOLD:
+                    return None
+            self._prev_thumb = thumb
+
             return frame
 
         except Exception as e:
@@ -152,10 +278,25 @@ class ScreenCapture:
             return None
 
     def _crop_fullscreen_frame(self, frame: np.ndarray) -> np.ndarray:
-        """Attempt to crop fullscreen frame to the actual game area."""
+        """
+        Attempt to crop fullscreen frame to the actual game area.
+        The game area is detected on the first frame and then reused, and
+        re-detected every config.CROP_REFRESH_FRAMES frames.
+        """
+        if self._crop_rect is None or self._crop_age >= config.CROP_REFRESH_FRAMES:
+            self._crop_rect = self._find_game_area(frame)
+            self._crop_age = 0
+        self._crop_age += 1
+
+        x, y, w, h = self._crop_rect
+        return frame[y:y+h, x:x+w]
+
+    def _find_game_area(self, frame: np.ndarray) -> Tuple[int, int, int, int]:
+        """Locate the game area in a fullscreen frame as (x, y, w, h)."""
+        full_frame = (0, 0, frame.shape[1], frame.shape[0])
         try:
             # Convert to grayscale for processing
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
             
             # Apply threshold to find dark areas (usually UI elements)
             _, thresh = cv2.threshold(gray, 30, 255, cv2.THRESH_BINARY)
@@ -166,10 +307,15 @@ class ScreenCapture:
             if contours:
                 # Find the largest contour that's not the entire frame
                 max_area = frame.shape[0] * frame.shape[1] * 0.95  # 95% of frame
-                valid_contours = [c for c in contours if cv2.contourArea(c) < max_area]
+                areas = np.fromiter(
+                    (cv2.contourArea(c) for c in contours),
+                    dtype=np.float64,
+                    count=len(contours)
+                )
+                areas[areas >= max_area] = -1.0
                 
-                if valid_contours:
-                    largest = max(valid_contours, key=cv2.contourArea)
+                if areas.max() >= 0:
+                    largest = contours[int(areas.argmax())]
                     x, y, w, h = cv2.boundingRect(largest)
                     
                     # Add some padding
@@ -179,12 +325,12 @@ class ScreenCapture:
                     w = min(frame.shape[1] - x, w + 2 * padding)
                     h = min(frame.shape[0] - y, h + 2 * padding)
                     
-                    return frame[y:y+h, x:x+w]
+                    return x, y, w, h
             
-            return frame
+            return full_frame
         except Exception as e:
             print(f"Error cropping fullscreen frame: {e}")
-            return frame
+            return full_frame
 
     def get_current_simulator(self) -> Optional[str]:
         """Return the currently detected simulator type."""
@@ -196,4 +342,9 @@ class ScreenCapture:
 
     def cleanup(self):
         """Clean up resources."""
-        self.sct.close() 
\ No newline at end of file
+        if self._dx is not None:
+            self._dx.release()
+        # Instances of threads that did not close their own
+        for sct in self._scts:
+            sct.close()
+        self._scts = [] 
\ No newline at end of file
@@ -3,72 +3,148 @@ Slope calculator module for E6 TruGolf Grass Slope Detection System.
 Implements multiple methods for slope detection.
 """
 
-import cv2
-import numpy as np
+from __future__ import annotations
+
+import concurrent.futures
+import os
 from typing import Tuple, List, Optional
 import config
+from lazy_import import LazyModule
+
+# Heavy modules are loaded on first use, so importing this module is cheap
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
+fast_texture = LazyModule("fast_texture")
+slope_math = LazyModule("slope_math")
+
+# Clamp limits as plain floats for slope_math.combine
+MAX_SLOPE_ANGLE = float(config.MAX_SLOPE_ANGLE)
+MAX_SIDE_SLOPE = float(config.MAX_SIDE_SLOPE)
+
+_cv2_configured = False
+
+def _configure_cv2():
+    """
+    Enable OpenCV's optimized code paths and cap its thread pool once per
+    process, so it does not oversubscribe cores alongside the detector pool.
+    """
+    global _cv2_configured
+    if _cv2_configured:
+        return
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(min(config.OPENCV_THREADS, os.cpu_count() or 1))
+    _cv2_configured = True
 
 class SlopeCalculator:
     def __init__(self):
+        _configure_cv2()
         self.method_weights = {
             'horizon': 0.4,
             'texture': 0.3,
             'perspective': 0.3
         }
+        # Weights as plain floats in the order slope_math.combine takes them
+        self._weights = (
+            float(self.method_weights['horizon']),
+            float(self.method_weights['texture']),
+            float(self.method_weights['perspective'])
+        )
+        # Workers for running the detectors concurrently; the OpenCV calls
+        # and the Numba texture kernel release the GIL
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="slope"
+        )
+        # Minimum grass pixel count for slope detection, per mask shape
+        self._min_grass_shape = None
+        self._min_grass_pixels = 0
+        # Scratch buffers reused across frames, keyed by name
+        self._buffers = {}
+        # Signature of the last grass mask and the result computed for it
+        self._last_signature = None
+        self._last_result = None
+
+    def _buffer(self, name: str, shape: Tuple[int, ...], dtype) -> np.ndarray:
+        """Return a persistent scratch buffer, reallocated when its shape changes."""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer
+
+    @staticmethod
+    def _downsample_mask(grass_mask: np.ndarray, scale: float) -> np.ndarray:
+        """Resize a binary mask by scale, keeping it binary."""
+        if scale == 1.0:
+            return grass_mask
+        return cv2.resize(grass_mask, None, fx=scale, fy=scale,
+                          interpolation=cv2.INTER_NEAREST)
 
-    def detect_horizon_line(self, grass_mask: np.ndarray, frame: np.ndarray) -> Tuple[float, float]:
+    def detect_horizon_line(self, grass_mask: np.ndarray, frame: np.ndarray,
+                            scale: float = config.HORIZON_SCALE) -> Tuple[float, float]:
         """
-        Find horizon using edge detection and Hough transform.
+        Find horizon by fitting a line to the top edge of the grass.
+        The mask is downsampled by scale first; line angles are scale-invariant,
+        and the minimum horizon length is scaled to match.
         Returns (slope_angle, confidence).
         """
-        # Apply Canny edge detection
-        edges = cv2.Canny(grass_mask, *config.EDGE_THRESHOLD)
-        
-        # Find lines using Hough transform
-        lines = cv2.HoughLinesP(
-            edges,
-            rho=1,
-            theta=np.pi/180,
-            threshold=config.HOUGH_THRESHOLD,
-            minLineLength=100,
-            maxLineGap=10
-        )
-        
-        if lines is None:
+        grass_mask = self._downsample_mask(grass_mask, scale)
+
+        # The top-most grass pixel of each column traces the horizon. Holes
+        # cut into the grass (bunkers, trees, the ball) lie below it, so
+        # unlike an average over every mask edge they cannot pull the angle
+        grass = np.greater(grass_mask, 0, out=self._buffer('horizon_grass', grass_mask.shape, bool))
+        top = grass.argmax(axis=0)
+        # Columns without grass, or whose grass reaches the top of the
+        # frame, do not show the horizon
+        columns = np.flatnonzero(top > 0)
+        if columns.size < max(2, int(100 * scale)):
             return 0.0, 0.0
-            
-        # Calculate angles for all lines
-        angles = []
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
-            if x2 - x1 != 0:  # Avoid division by zero
-                angle = np.arctan((y2 - y1) / (x2 - x1)) * 180 / np.pi
-                angles.append(angle)
-        
-        if not angles:
+
+        # Robust (Huber) fit, so a few columns topped by green blobs above
+        # the horizon do not tilt the line
+        points = np.column_stack((columns, top[columns])).astype(np.float32)
+        vx, vy, x0, y0 = cv2.fitLine(points, cv2.DIST_HUBER, 0, 0.01, 0.01).ravel()
+        if vx == 0:
             return 0.0, 0.0
-            
-        # Calculate median angle and confidence
-        median_angle = np.median(angles)
-        confidence = min(1.0, len(angles) / 10)  # More lines = higher confidence
-        
-        return median_angle, confidence
+        # arctan (not arctan2) so the angle does not depend on the line direction
+        angle = np.degrees(np.arctan(vy / vx))
+
+        # Confidence from the fraction of columns that lie on the fitted line
+        distance = np.abs((points[:, 0] - x0) * vy - (points[:, 1] - y0) * vx)
+        confidence = np.count_nonzero(distance <= 2.0) / columns.size
+
+        return float(angle), float(confidence)
 
     def calculate_texture_gradient(self, grass_region: np.ndarray) -> Tuple[float, float]:
         """
         Analyze grass texture for slope information.
         Returns (slope_angle, confidence).
+
+        With Numba installed, 8-bit single-channel input goes through a fused
+        kernel that computes the same statistics without per-pixel arrays.
         """
+        if (fast_texture.NUMBA_AVAILABLE and grass_region.dtype == np.uint8
+                and grass_region.ndim == 2):
+            return fast_texture.texture_gradient(grass_region)
+
+        shape = grass_region.shape
+
         # Calculate gradients using Sobel operators
-        sobelx = cv2.Sobel(grass_region, cv2.CV_64F, 1, 0, ksize=3)
-        sobely = cv2.Sobel(grass_region, cv2.CV_64F, 0, 1, ksize=3)
+        sobelx = cv2.Sobel(grass_region, cv2.CV_32F, 1, 0,
+                           dst=self._buffer('sobelx', shape, np.float32), ksize=3)
+        sobely = cv2.Sobel(grass_region, cv2.CV_32F, 0, 1,
+                           dst=self._buffer('sobely', shape, np.float32), ksize=3)
         
         # Calculate gradient magnitude and direction
-        magnitude = np.sqrt(sobelx**2 + sobely**2)
-        direction = np.arctan2(sobely, sobelx) * 180 / np.pi
+        magnitude = cv2.magnitude(sobelx, sobely,
+                                  magnitude=self._buffer('magnitude', shape, np.float32))
+        direction = np.arctan2(sobely, sobelx,
+                               out=self._buffer('direction', shape, np.float32))
+        np.degrees(direction, out=direction)
         
         # Calculate weighted average direction
-        valid_mask = magnitude > np.mean(magnitude)
+        valid_mask = np.greater(magnitude, np.mean(magnitude),
+                                out=self._buffer('valid', shape, np.bool_))
         if not np.any(valid_mask):
             return 0.0, 0.0
             
@@ -82,11 +158,16 @@ class SlopeCalculator:
         
         return weighted_direction, confidence
 
-    def compute_perspective_slope(self, grass_mask: np.ndarray) -> Tuple[float, float]:
+    def compute_perspective_slope(self, grass_mask: np.ndarray,
+                                  scale: float = config.PERSPECTIVE_SCALE) -> Tuple[float, float]:
         """
         Analyze perspective for slope information.
+        The mask is downsampled by scale first; the fitted rectangle angle and
+        the area ratio used for confidence are scale-invariant.
         Returns (slope_angle, confidence).
         """
+        grass_mask = self._downsample_mask(grass_mask, scale)
+
         # Find contours of grass regions
         contours, _ = cv2.findContours(
             grass_mask,
@@ -98,14 +179,20 @@ class SlopeCalculator:
             return 0.0, 0.0
             
         # Find the largest contour
-        largest_contour = max(contours, key=cv2.contourArea)
+        areas = np.fromiter(
+            (cv2.contourArea(c) for c in contours),
+            dtype=np.float64,
+            count=len(contours)
+        )
+        largest_index = int(areas.argmax())
+        largest_contour = contours[largest_index]
         
         # Fit a rectangle to the contour
         rect = cv2.minAreaRect(largest_contour)
         angle = rect[2]
         
         # Calculate confidence based on contour area and shape
-        area = cv2.contourArea(largest_contour)
+        area = areas[largest_index]
         confidence = min(1.0, area / (grass_mask.shape[0] * grass_mask.shape[1] * 0.1))
         
         return angle, confidence
@@ -114,34 +201,46 @@ class SlopeCalculator:
         """
         Combine multiple methods to calculate final slope angle.
         Returns (slope_angle, side_slope, confidence).
+        The last result is reused while the grass mask is unchanged, and
+        masks with too little grass return zero confidence without analysis.
         """
-        # Get results from all methods
-        horizon_angle, horizon_conf = self.detect_horizon_line(grass_mask, frame)
-        texture_angle, texture_conf = self.calculate_texture_gradient(grass_mask)
+        # Skip the detectors when there is too little grass to measure
+        if grass_mask.shape != self._min_grass_shape:
+            self._min_grass_shape = grass_mask.shape
+            self._min_grass_pixels = int(config.MIN_SLOPE_COVERAGE * grass_mask.size)
+        if cv2.countNonZero(grass_mask) < self._min_grass_pixels:
+            return 0.0, 0.0, 0.0
+
+        # Cheap signature of the mask; area averaging makes small changes
+        # anywhere in the mask alter the thumbnail
+        thumb = cv2.resize(grass_mask, (32, 32), interpolation=cv2.INTER_AREA)
+        signature = hash(thumb.tobytes())
+        if signature == self._last_signature:
+            return self._last_result
+
+        # Get results from all methods, running them in parallel; the
+        # calling thread handles the perspective method itself.
+        # Each method works at its own resolution: texture on the full mask,
+        # horizon at HORIZON_SCALE and perspective at PERSPECTIVE_SCALE
+        horizon_future = self._pool.submit(self.detect_horizon_line, grass_mask, frame)
+        texture_future = self._pool.submit(self.calculate_texture_gradient, grass_mask)
         perspective_angle, perspective_conf = self.compute_perspective_slope(grass_mask)
-        
-        # Weight the results
-        weighted_angle = (
-            horizon_angle * self.method_weights['horizon'] * horizon_conf +
-            texture_angle * self.method_weights['texture'] * texture_conf +
-            perspective_angle * self.method_weights['perspective'] * perspective_conf
-        )
-        
-        # Calculate overall confidence
-        total_confidence = (
-            horizon_conf * self.method_weights['horizon'] +
-            texture_conf * self.method_weights['texture'] +
-            perspective_conf * self.method_weights['perspective']
+        horizon_angle, horizon_conf = horizon_future.result()
+        texture_angle, texture_conf = texture_future.result()
+        
+        # Weight the results and clamp to expected ranges
+        weighted_angle, side_slope, total_confidence = slope_math.combine(
+            float(horizon_angle), float(horizon_conf),
+            float(texture_angle), float(texture_conf),
+            float(perspective_angle), float(perspective_conf),
+            *self._weights,
+            MAX_SLOPE_ANGLE, MAX_SIDE_SLOPE
         )
         
-        # Calculate side slope (left/right tilt)
-        side_slope = np.arctan2(
-            np.sin(weighted_angle * np.pi / 180),
-            np.cos(weighted_angle * np.pi / 180)
-        ) * 180 / np.pi
-        
-        # Clamp angles to expected ranges
-        weighted_angle = np.clip(weighted_angle, -config.MAX_SLOPE_ANGLE, config.MAX_SLOPE_ANGLE)
-        side_slope = np.clip(side_slope, -config.MAX_SIDE_SLOPE, config.MAX_SIDE_SLOPE)
-        
-        return weighted_angle, side_slope, total_confidence 
\ No newline at end of file
+        self._last_signature = signature
+        self._last_result = (weighted_angle, side_slope, total_confidence)
+        return self._last_result 
+
+    def cleanup(self):
+        """Clean up resources."""
+        self._pool.shutdown(wait=True)
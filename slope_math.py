@@ -0,0 +1,50 @@
+"""
+Slope math module for E6 TruGolf and GSPro Grass Slope Detection System.
+Combines the per-method slope estimates in compiled scalar code.
+"""
+
+from typing import Tuple
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def combine(horizon_angle: float, horizon_conf: float,
+            texture_angle: float, texture_conf: float,
+            perspective_angle: float, perspective_conf: float,
+            horizon_weight: float, texture_weight: float, perspective_weight: float,
+            max_slope: float, max_side_slope: float) -> Tuple[float, float, float]:
+    """
+    Weight the method results into a final estimate.
+    Returns (slope_angle, side_slope, confidence).
+    """
+    # Weight the results
+    horizon_factor = horizon_weight * horizon_conf
+    texture_factor = texture_weight * texture_conf
+    perspective_factor = perspective_weight * perspective_conf
+    weighted_angle = (
+        horizon_angle * horizon_factor +
+        texture_angle * texture_factor +
+        perspective_angle * perspective_factor
+    )
+
+    # Calculate overall confidence
+    total_confidence = horizon_factor + texture_factor + perspective_factor
+
+    # Calculate side slope (left/right tilt), wrapped to [-180, 180)
+    side_slope = ((weighted_angle + 180.0) % 360.0) - 180.0
+
+    # Clamp angles to expected ranges
+    weighted_angle = max(-max_slope, min(max_slope, weighted_angle))
+    side_slope = max(-max_side_slope, min(max_side_slope, side_slope))
+
+    return weighted_angle, side_slope, total_confidence
+
+
+if NUMBA_AVAILABLE:
+    # Compile to native code with float64 scalars; no interpreter or ufunc
+    # dispatch inside the arithmetic
+    combine = njit(cache=True)(combine)
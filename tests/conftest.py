@@ -0,0 +1,8 @@
+"""
+Pytest configuration: make the top-level application modules importable.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,73 @@
+"""
+Tests for the slope calculator using synthetic grass masks with known angles.
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from slope_calculator import SlopeCalculator
+
+
+def make_horizon_mask(angle_deg: float, width: int = 960, height: int = 540) -> np.ndarray:
+    """Grass below a straight horizon through the frame center at angle_deg."""
+    slope = math.tan(math.radians(angle_deg))
+    center_x, center_y = width / 2, height / 2
+    left_y = int(round(center_y + slope * (0 - center_x)))
+    right_y = int(round(center_y + slope * (width - 1 - center_x)))
+    mask = np.zeros((height, width), dtype=np.uint8)
+    polygon = np.array([[0, left_y], [width - 1, right_y],
+                        [width - 1, height - 1], [0, height - 1]], dtype=np.int32)
+    cv2.fillPoly(mask, [polygon], 255)
+    return mask
+
+
+@pytest.fixture
+def calculator():
+    calc = SlopeCalculator()
+    yield calc
+    calc.cleanup()
+
+
+@pytest.mark.parametrize("angle", [2, 5, 8, 12, -5, -10, 15, 20])
+def test_detect_horizon_line_recovers_known_angle(calculator, angle):
+    detected, confidence = calculator.detect_horizon_line(make_horizon_mask(angle), None)
+    assert detected == pytest.approx(angle, abs=1.0)
+    assert confidence > 0.5
+
+
+def add_distractors(mask: np.ndarray, angle_deg: float, count: int, seed: int) -> np.ndarray:
+    """Cut elliptical holes into the grass and add green blobs above the horizon."""
+    rng = np.random.default_rng(seed)
+    height, width = mask.shape
+    slope = math.tan(math.radians(angle_deg))
+    for _ in range(count):
+        # Bunker or tree shadow well inside the grass
+        axes = (int(rng.integers(30, 120)), int(rng.integers(15, 60)))
+        center_x = int(rng.integers(50, width - 50))
+        center_y = int(height / 2 + slope * (center_x - width / 2)
+                       + rng.integers(axes[0] + 10, axes[0] + 150))
+        cv2.ellipse(mask, (center_x, center_y), axes, float(rng.uniform(0, 180)),
+                    0, 360, 0, -1)
+        # Tree canopy detected as grass above the horizon
+        axes = (int(rng.integers(10, 40)), int(rng.integers(8, 25)))
+        center = (int(rng.integers(50, width - 50)), int(rng.integers(20, 120)))
+        cv2.ellipse(mask, center, axes, float(rng.uniform(0, 180)), 0, 360, 255, -1)
+    return mask
+
+
+@pytest.mark.parametrize("angle", [-10, -4, 3, 10])
+@pytest.mark.parametrize("count", [1, 3, 6])
+def test_detect_horizon_line_ignores_distractors(calculator, angle, count):
+    mask = add_distractors(make_horizon_mask(angle), angle, count, seed=count)
+    detected, confidence = calculator.detect_horizon_line(mask, None)
+    assert detected == pytest.approx(angle, abs=1.0)
+    assert confidence > 0.5
+
+
+def test_detect_horizon_line_without_edges(calculator):
+    mask = np.zeros((540, 960), dtype=np.uint8)
+    assert calculator.detect_horizon_line(mask, None) == (0.0, 0.0)
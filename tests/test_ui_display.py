@@ -0,0 +1,32 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from ui_display import DisplayUI
+
+
+HUD_TEXTS = ("Simulator: GSPro", "Slope: 3.2°", "Side Slope: -1.5°", "Confidence: 87%")
+
+
+@pytest.mark.parametrize("seed", [None, 0, 1])
+def test_hud_matches_direct_puttext(seed):
+    if seed is None:
+        background = np.zeros((240, 400, 3), np.uint8)
+    else:
+        rng = np.random.default_rng(seed)
+        background = rng.integers(0, 256, (240, 400, 3), dtype=np.uint8)
+
+    expected = background.copy()
+    y_offset = 30
+    for text in HUD_TEXTS:
+        cv2.putText(expected, text, (10, y_offset), cv2.FONT_HERSHEY_SIMPLEX,
+                    1, (255, 255, 255), 2)
+        y_offset += 40
+
+    actual = background.copy()
+    hud_alpha, x, y = DisplayUI._render_hud(HUD_TEXTS)
+    DisplayUI._blend_white(actual, hud_alpha, x, y)
+
+    diff = np.abs(actual.astype(np.int16) - expected.astype(np.int16))
+    assert diff.max() <= 1
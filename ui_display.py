@@ -3,10 +3,45 @@ UI display module for E6 TruGolf and GSPro Grass Slope Detection System.
 Handles real-time display and visualization.
 """
 
-import cv2
-import numpy as np
+from __future__ import annotations
+
+import math
+from functools import lru_cache
 from typing import Tuple, Optional
 import config
+from lazy_import import LazyModule
+
+# Heavy modules are loaded on first use, so importing this module is cheap
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
+
+# HUD text style
+TEXT_SCALE = 1
+TEXT_THICKNESS = 2
+TEXT_PADDING = TEXT_THICKNESS  # Room for the stroke outside getTextSize's box
+
+@lru_cache(maxsize=1024)
+def _render_text_alpha(text: str) -> Tuple[np.ndarray, int]:
+    """
+    Rasterize a HUD text line once, white on black, so the canvas holds
+    the glyph coverage (including any antialiasing) as a 0-255 alpha.
+    Returns the alpha and the distance from its top edge to the baseline.
+    """
+    (width, height), baseline = cv2.getTextSize(
+        text, cv2.FONT_HERSHEY_SIMPLEX, TEXT_SCALE, TEXT_THICKNESS
+    )
+    ascent = height + TEXT_PADDING
+    canvas = np.zeros((ascent + baseline + TEXT_PADDING, width + 2 * TEXT_PADDING), np.uint8)
+    cv2.putText(
+        canvas,
+        text,
+        (TEXT_PADDING, ascent),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        TEXT_SCALE,
+        255,
+        TEXT_THICKNESS
+    )
+    return canvas, ascent
 
 class DisplayUI:
     def __init__(self):
@@ -14,26 +49,43 @@ class DisplayUI:
         cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
         cv2.resizeWindow(self.window_name, config.DISPLAY_WIDTH, config.DISPLAY_HEIGHT)
 
+        # Composed HUD text alpha and the strings it was built from
+        self._hud_texts = None
+        self._hud = None
+
+        # Lookup tables for blending the green grass overlay:
+        # every channel is dimmed, grass pixels get green added
+        values = np.arange(256, dtype=np.float64)
+        self._dim_lut = np.clip(
+            np.round(values * (1 - config.OVERLAY_ALPHA)), 0, 255
+        ).astype(np.uint8)
+        green_lut = np.clip(
+            np.round(values * (1 - config.OVERLAY_ALPHA) + 255 * config.OVERLAY_ALPHA), 0, 255
+        ).astype(np.uint8)
+        # Per-channel (B, G, R) table giving the blended color of grass pixels
+        self._grass_lut = np.stack(
+            [self._dim_lut, green_lut, self._dim_lut], axis=-1
+        ).reshape(256, 1, 3)
+        self._grass_buffer = None  # Reused grass-tinted frame
+
     def create_overlay(self, frame: np.ndarray, grass_mask: np.ndarray,
                       slope_angle: float, side_slope: float,
                       confidence: float, simulator: Optional[str] = None) -> np.ndarray:
         """Create visualization overlay with slope information."""
-        # Create a copy of the frame for drawing
-        overlay = frame.copy()
+        # Create a BGR copy of the frame for drawing
+        if frame.ndim == 3 and frame.shape[2] == 4:
+            overlay = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+        else:
+            overlay = frame.copy()
         
-        # Create colored mask for grass regions
-        grass_overlay = np.zeros_like(frame)
-        grass_overlay[grass_mask > 0] = [0, 255, 0]  # Green for grass
-        
-        # Blend the grass overlay with the original frame
-        cv2.addWeighted(
-            grass_overlay,
-            config.OVERLAY_ALPHA,
-            overlay,
-            1 - config.OVERLAY_ALPHA,
-            0,
-            overlay
-        )
+        # Blend green over grass regions; same result as addWeighted with a
+        # green-on-black overlay. The tinted frame is copied through the
+        # grass mask directly, so no boolean mask or fancy indexing is needed
+        if self._grass_buffer is None or self._grass_buffer.shape != overlay.shape:
+            self._grass_buffer = np.empty_like(overlay)
+        cv2.LUT(overlay, self._grass_lut, dst=self._grass_buffer)
+        cv2.LUT(overlay, self._dim_lut, dst=overlay)
+        cv2.copyTo(self._grass_buffer, grass_mask, overlay)
         
         # Draw slope direction indicator
         self._draw_slope_indicator(overlay, slope_angle, side_slope)
@@ -53,9 +105,9 @@ class DisplayUI:
         arrow_length = min(width, height) * 0.3
         
         # Calculate arrow direction
-        angle_rad = np.radians(slope_angle)
-        dx = arrow_length * np.sin(angle_rad)
-        dy = arrow_length * np.cos(angle_rad)
+        angle_rad = math.radians(slope_angle)
+        dx = arrow_length * math.sin(angle_rad)
+        dy = arrow_length * math.cos(angle_rad)
         
         # Draw main slope arrow
         end_point = (
@@ -73,9 +125,9 @@ class DisplayUI:
         
         # Draw side slope indicator if significant
         if abs(side_slope) > 1.0:
-            side_angle_rad = np.radians(side_slope)
-            side_dx = arrow_length * 0.5 * np.sin(side_angle_rad)
-            side_dy = arrow_length * 0.5 * np.cos(side_angle_rad)
+            side_angle_rad = math.radians(side_slope)
+            side_dx = arrow_length * 0.5 * math.sin(side_angle_rad)
+            side_dy = arrow_length * 0.5 * math.cos(side_angle_rad)
             
             side_end = (
                 int(center[0] + side_dx),
@@ -100,50 +152,56 @@ class DisplayUI:
         side_text = f"Side Slope: {side_slope:.1f}°"
         conf_text = f"Confidence: {confidence*100:.0f}%"
         
-        # Add text to overlay
+        # Add text to overlay; the HUD is only re-composed when a line changes
+        texts = (simulator_text, slope_text, side_text, conf_text)
+        if texts != self._hud_texts:
+            self._hud = self._render_hud(texts)
+            self._hud_texts = texts
+        hud_alpha, x, y = self._hud
+        self._blend_white(overlay, hud_alpha, x, y)
+
+    @staticmethod
+    def _render_hud(texts: Tuple[str, ...]) -> Tuple[np.ndarray, int, int]:
+        """
+        Compose the glyph alphas of the HUD lines into a single alpha.
+        Returns the alpha and the overlay position of its top-left corner.
+        """
+        placed = []
         y_offset = 30
-        cv2.putText(
-            overlay,
-            simulator_text,
-            (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (255, 255, 255),
-            2
-        )
-        
-        y_offset += 40
-        cv2.putText(
-            overlay,
-            slope_text,
-            (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (255, 255, 255),
-            2
-        )
-        
-        y_offset += 40
-        cv2.putText(
-            overlay,
-            side_text,
-            (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (255, 255, 255),
-            2
-        )
-        
-        y_offset += 40
-        cv2.putText(
-            overlay,
-            conf_text,
-            (10, y_offset),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (255, 255, 255),
-            2
-        )
+        for text in texts:
+            alpha, ascent = _render_text_alpha(text)
+            placed.append((alpha, 10 - TEXT_PADDING, y_offset - ascent))
+            y_offset += 40
+
+        left = min(x for _, x, _ in placed)
+        top = min(y for _, _, y in placed)
+        right = max(x + alpha.shape[1] for alpha, x, _ in placed)
+        bottom = max(y + alpha.shape[0] for alpha, _, y in placed)
+
+        # Lines do not overlap, so the maximum is the combined coverage
+        hud = np.zeros((bottom - top, right - left), dtype=np.uint8)
+        for alpha, x, y in placed:
+            region = hud[y - top:y - top + alpha.shape[0], x - left:x - left + alpha.shape[1]]
+            np.maximum(region, alpha, out=region)
+        return hud, left, top
+
+    @staticmethod
+    def _blend_white(overlay: np.ndarray, alpha: np.ndarray, x: int, y: int):
+        """
+        Blend white into the overlay through alpha, placed with its top-left
+        corner at (x, y). For text alphas this matches drawing the text with
+        cv2.putText directly, whether or not OpenCV antialiases it.
+        """
+        # Clip the alpha to the overlay
+        x0, y0 = max(x, 0), max(y, 0)
+        x1 = min(x + alpha.shape[1], overlay.shape[1])
+        y1 = min(y + alpha.shape[0], overlay.shape[0])
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        roi = overlay[y0:y1, x0:x1]
+        a = alpha[y0 - y:y1 - y, x0 - x:x1 - x, np.newaxis].astype(np.uint16)
+        roi += (((255 - roi) * a + 127) // 255).astype(np.uint8)
 
     def show_frame(self, frame: np.ndarray):
         """Display the frame in the window."""